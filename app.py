@@ -1,9 +1,33 @@
+import io
+import hashlib
+import matplotlib
+from concurrent.futures import ThreadPoolExecutor
 import streamlit as st
 import pandas as pd
 import zipfile
+from pathlib import Path
 from labcal import process_cal, plot_cal
 
 
+# Plots are only rendered to PNG; no interactive backend is needed
+matplotlib.use('Agg')
+
+# Plotting functions shown in the plot tabs and their top_k
+PLOT_TABS = [
+    ('event_category', 10),
+    ('organiser', 10),
+    ('event_category_by_organiser', 10),
+    ('organiser_detail', 20),
+    ('equip_overall', 10),
+    ('equip_details', 10),
+    ('participant_stats', 10),
+    ('participants_per_month', 10)
+]
+
+# The caches are shared by all sessions; expire entries to bound the memory of a long-running app
+CACHE_TTL = 24 * 60 * 60
+
+
 def reset_session_state():
     """
     Reset the session state.
@@ -14,38 +38,103 @@ def reset_session_state():
     st.session_state.date_end = None
 
 
+def hash_file(file_bytes: bytes) -> str:
+    """
+    Hash the contents of an uploaded file to be used as a cache key.
+    """
+    return hashlib.blake2b(file_bytes, digest_size=16).hexdigest()
+
+
+@st.cache_data(show_spinner=False, max_entries=8, ttl=CACHE_TTL)
+def load_calendar(file_hash: str, _file_bytes: bytes) -> tuple[pd.DataFrame, int]:
+    """
+    Parse the uploaded calendar file and return the cleaned DataFrame and the number of events.
+    Cached on `file_hash` so that reruns of the app do not parse the calendar again.
+    """
+    events = process_cal.parse_ics_fast(_file_bytes.decode('utf-8'))
+    
+    # Create pd.DataFrame from the parsed events
+    df = pd.DataFrame.from_records(events)
+    
+    # Clean the DataFrame
+    clean_df = process_cal.clean_calendar_dataframe(df, verbose=False)
+    
+    # Sort events by start date so that time periods can be selected by binary search
+    clean_df = clean_df.sort_values('event_start', ignore_index=True)
+    
+    return clean_df, len(events)
+
+
+@st.cache_data(show_spinner=False, max_entries=32, ttl=CACHE_TTL)
+def verify_dates(_df: pd.DataFrame, file_hash: str, 
+                 date_start, date_end) -> tuple[pd.Timestamp, str, pd.Timestamp, str]:
+    """
+    Cached wrapper around `plot_cal.parse_and_verify_dates`. The DataFrame itself is not hashed;
+    it is keyed on the hash of the calendar file it was loaded from.
+    """
+    return plot_cal.parse_and_verify_dates(_df, date_start, date_end)
+
+
+@st.cache_data(show_spinner=False, max_entries=32, ttl=CACHE_TTL)
+def render_plots(_df: pd.DataFrame, file_hash: str, start: pd.Timestamp, end: pd.Timestamp, 
+                 start_date: str, end_date: str) -> dict[str, tuple[bytes, str]]:
+    """
+    Render all plots of `PLOT_TABS` in a thread pool and return the PNG bytes and the file path 
+    of the saved plot image for each plotting function. `_df` is not hashed; as it only contains 
+    the events between `start` and `end` it is cached on `file_hash` and these time stamps. The 
+    date strings `start_date` and `end_date` are only used for the plot titles and file names.
+    """
+    aggregates = plot_cal.precompute_aggregates(_df)
+    
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = {
+            func: executor.submit(plot_cal.plot_calendar, 
+                                  _df, 
+                                  start_date=start_date, 
+                                  end_date=end_date, 
+                                  func=func, 
+                                  top_k=top_k, 
+                                  return_png=True, 
+                                  prefiltered=True, 
+                                  dpi=150, 
+                                  aggregates=aggregates)
+            for func, top_k in PLOT_TABS
+            }
+        
+    return {func: future.result() for func, future in futures.items()}
+
+
 def process():
     st.session_state.button_clicked = True
     
-    # Set output_dir to save plots
-    output_dir = plot_cal.set_output_dir()
+    # Folder of the plots and the .xlsx in the .zip download; nothing is written to disk
+    output_dir = Path(plot_cal.OUTPUT_DIR)
 
     # Start processing calendar file
     ics_file = st.session_state.uploaded_file
     st.subheader(f':blue[**Kalender** wird bearbeitet ⏳]')
     
-    # Load calendar
-    ics_content = ics_file.read().decode('utf-8')
-    cal = process_cal.streamlit_load_and_parse_calendar(ics_content)
-    st.write(f':green[**{len(cal.events)} Einträge** in *{ics_file.name}* gefunden.]')
-    
-    # Create pd.DataFrame from Calendar object
-    df = process_cal.create_dataframe_from_calendar(cal=cal, verbose=False)
-    
-    # Clean the DataFrame
-    clean_df = process_cal.clean_calendar_dataframe(df, verbose=False)
+    # Load calendar and create a cleaned pd.DataFrame from it
+    ics_bytes = ics_file.getvalue()
+    ics_hash = hash_file(ics_bytes)
+    clean_df, n_events = load_calendar(ics_hash, ics_bytes)
+    st.write(f':green[**{n_events} Einträge** in *{ics_file.name}* gefunden.]')
     
     # Parse provided start and end date and check if they exist in the DataFrane
-    start_date, start_date_str, end_date, end_date_str = plot_cal.parse_and_verify_dates(clean_df, 
-                                                                                         st.session_state.date_start, 
-                                                                                         st.session_state.date_end)
+    start_date, start_date_str, end_date, end_date_str = verify_dates(clean_df, 
+                                                                      ics_hash, 
+                                                                      st.session_state.date_start, 
+                                                                      st.session_state.date_end)
     
-    # Create DataFrame for provided time period
-    select_df = clean_df.loc[(clean_df['event_start'] >= start_date) & (clean_df['event_end'] <= end_date)].reset_index(drop=True).copy()
+    # Create DataFrame for provided time period; clean_df is sorted by event_start
+    start_idx = clean_df['event_start'].searchsorted(start_date, side='left')
+    end_idx = clean_df['event_start'].searchsorted(end_date, side='right')
+    select_df = clean_df.iloc[start_idx:end_idx]
+    select_df = select_df.loc[select_df['event_end'] <= end_date].reset_index(drop=True)
 
     # Print adjustments for start_date and end_date if applicable
-    start_date_session = pd.to_datetime(st.session_state.date_start).tz_localize('GMT').date()
-    end_date_session = pd.to_datetime(st.session_state.date_end).tz_localize('GMT').date()
+    start_date_session = pd.to_datetime(st.session_state.date_start).date()
+    end_date_session = pd.to_datetime(st.session_state.date_end).date()
 
     if start_date.date() != start_date_session:
         st.write(f"Das Startdatum **{start_date_session.strftime('%d.%m.%Y')}** wurde im Kalender nicht gefunden und auf den ersten verfügbaren Kalenderzeitpunkt **{start_date.date().strftime('%d.%m.%Y')}** festgelegt.")
@@ -55,6 +144,10 @@ def process():
 
     st.write(f':green[Für den Zeitraum {start_date_str} bis {end_date_str} existieren **{len(select_df)}** Kalendereinträge.]')
     
+    # Render all plots; cached on the calendar file and the exact time stamps of the time period,
+    # as different time stamps can share the same date strings
+    plots = render_plots(select_df, ics_hash, start_date, end_date, start_date_str, end_date_str)
+    
     # Define tabs for displaying the plots
     tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8, tab9, tab10 = st.tabs(['Plot 1',
                                                                            'Plot 2',
@@ -69,64 +162,31 @@ def process():
         
     with tab1:
         # Plot event_categories
-        eventcat_title = plot_cal.plot_calendar(select_df, 
-                                                start_date=start_date_str, 
-                                                end_date=end_date_str,
-                                                func='event_category', 
-                                                streamlit=True)
+        st.image(plots['event_category'][0], use_column_width=True)
     with tab2:
         # Plot organiser
-        organiser_title = plot_cal.plot_calendar(select_df, 
-                                                 start_date=start_date_str, 
-                                                 end_date=end_date_str,
-                                                 func='organiser', 
-                                                 streamlit=True)
+        st.image(plots['organiser'][0], use_column_width=True)
     with tab3:
         # Plot event_categories by organiser
-        eventcat_by_organiser_title = plot_cal.plot_calendar(select_df, 
-                                                             start_date=start_date_str, 
-                                                             end_date=end_date_str, 
-                                                             func='event_category_by_organiser', 
-                                                             streamlit=True)
+        st.image(plots['event_category_by_organiser'][0], use_column_width=True)
     with tab4:
         # Plot organiser_detail
-        organiser_detail_title = plot_cal.plot_calendar(select_df, 
-                                                        start_date=start_date_str, 
-                                                        end_date=end_date_str, 
-                                                        func='organiser_detail',
-                                                        top_k=20, 
-                                                        streamlit=True)
+        st.image(plots['organiser_detail'][0], use_column_width=True)
     
     with tab5:
         # Plot overall equipment stats
-        all_equip_title = plot_cal.plot_calendar(select_df, 
-                                                 start_date=start_date_str, 
-                                                 end_date=end_date_str, 
-                                                 func='equip_overall', 
-                                                 streamlit=True)
+        st.image(plots['equip_overall'][0], use_column_width=True)
     
     with tab6:
         # Plot specific equipment stats
-        equip_stats_title = plot_cal.plot_calendar(select_df, 
-                                                   start_date=start_date_str, 
-                                                   end_date=end_date_str, 
-                                                   func='equip_details', 
-                                                   streamlit=True)
+        st.image(plots['equip_details'][0], use_column_width=True)
     with tab7:
         # Plot overall participant stats
-        participants_title = plot_cal.plot_calendar(select_df, 
-                                                    start_date=start_date_str, 
-                                                    end_date=end_date_str, 
-                                                    func='participant_stats', 
-                                                    streamlit=True)
+        st.image(plots['participant_stats'][0], use_column_width=True)
     
     with tab8:
         # Plot monthly participant stats
-        participants_per_month_title = plot_cal.plot_calendar(select_df, 
-                                                              start_date=start_date_str, 
-                                                              end_date=end_date_str, 
-                                                              func='participants_per_month', 
-                                                              streamlit=True)
+        st.image(plots['participants_per_month'][0], use_column_width=True)
 
     with tab9:
         st.dataframe(select_df)
@@ -138,40 +198,28 @@ def process():
         # Include a .xlsx with the selected DataFrame in the zip
         excel_filename = f"explab_{start_date_str.replace('.', '_')}_{end_date_str.replace('.', '_')}.xlsx"
         
-        with zipfile.ZipFile(str(output_dir.joinpath(zip_filename)), 'w') as zip_f:
-            if eventcat_title:
-                zip_f.write(eventcat_title)
-            if organiser_title:
-                zip_f.write(organiser_title)
-            if eventcat_by_organiser_title:
-                zip_f.write(eventcat_by_organiser_title)
-            if organiser_detail_title:
-                zip_f.write(organiser_detail_title)
-            if all_equip_title:
-                zip_f.write(all_equip_title)
-            if equip_stats_title:
-                zip_f.write(equip_stats_title)
-            if participants_title:
-                zip_f.write(participants_title)
-            if participants_per_month_title:
-                zip_f.write(participants_per_month_title)
+        # Write the .zip in memory; PNGs are already compressed and are stored as is, only the .xlsx gets deflated
+        zip_buffer = io.BytesIO()
+        
+        with zipfile.ZipFile(zip_buffer, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=1) as zip_f:
+            for png, img_path in plots.values():
+                zip_f.writestr(img_path, png, compress_type=zipfile.ZIP_STORED)
             
             # Convert timezone aware columns to time stamps as Excel can't handle them
-            df_xlsx = pd.DataFrame()
-            
-            for col in select_df.columns:
-                if isinstance(select_df[col].dtype, pd.DatetimeTZDtype):
-                    df_xlsx[col] = select_df[col].dt.strftime('%d.%m.%Y %H:%M:%S')
-                else:
-                    df_xlsx[col] = select_df[col]
-
-            df_xlsx.to_excel(str(output_dir.joinpath(excel_filename)), index=False)
-            zip_f.write(str(output_dir.joinpath(excel_filename)))
+            tz_columns = select_df.select_dtypes(include=['datetimetz']).columns
+            df_xlsx = select_df.assign(**{
+                col: select_df[col].dt.strftime('%d.%m.%Y %H:%M:%S') for col in tz_columns
+                })
+
+            xlsx_buffer = io.BytesIO()
+            with pd.ExcelWriter(xlsx_buffer, engine='xlsxwriter', 
+                                engine_kwargs={'options': {'strings_to_urls': False}}) as xlsx_writer:
+                df_xlsx.to_excel(xlsx_writer, index=False)
+            zip_f.writestr(str(output_dir.joinpath(excel_filename)), xlsx_buffer.getvalue())
         
         # Provide a download button for downloading the .zip
-        with open(str(output_dir.joinpath(zip_filename)), 'rb') as file:
-            st.download_button(label='Alle Plots herunterladen', data=file, file_name=zip_filename, 
-                               mime='application/zip', on_click=download_finished)
+        st.download_button(label='Alle Plots herunterladen', data=zip_buffer.getvalue(), file_name=zip_filename, 
+                           mime='application/zip', on_click=download_finished)
                     
             
 def download_finished():
@@ -1,25 +1,52 @@
+import io
 import re
 import pandas as pd
 import matplotlib.pyplot as plt
-import matplotlib_inline
+from matplotlib.figure import Figure
 import seaborn as sns
 import streamlit as st
 from pathlib import Path
 
 
 # Global plotting settings
-matplotlib_inline.backend_inline.set_matplotlib_formats('svg')
 sns.set_theme(style='whitegrid')
+
+# Pattern for replacing whitespaces and special chars in image titles
+IMG_TITLE_PATTERN = re.compile(r'[\s\W]+')
+
+# Available plotting functions
+PLOT_FUNCS = ['organiser', 
+              'organiser_detail', 
+              'event_category', 
+              'event_category_by_organiser',
+              'equip_details', 
+              'equip_overall', 
+              'participant_stats', 
+              'participants_per_month']
+
+# Folder for saving plots; also the folder of the plots in the app's .zip download
+OUTPUT_DIR = './output'
+
+# Offset for moving a date to the last day of its month
+MONTH_END = pd.offsets.MonthEnd(0)
+
+# Equipment columns and their labels
+EQUIP_COLUMNS = {
+    'equip_clevertouch': 'Clevertouch',
+    'equip_dt': 'Design Thinking',
+    'equip_eyetracking': 'Eye Tracking',
+    'equip_monitor': 'Präsentationsmonitor',
+    'equip_vr': 'VR'
+}
     
 
-def set_output_dir(dir_name: str = './output'):
+def set_output_dir(dir_name: str = OUTPUT_DIR):
+    """
+    Returns the output folder for saving plots and creates it if it does not exist yet.
+    """
     output_dir = Path(dir_name)
-    if not output_dir.exists():
-        output_dir.mkdir(parents=True)
+    output_dir.mkdir(parents=True, exist_ok=True)
     return output_dir    
-    
-# Output folder
-output_dir = set_output_dir()
 
 
 def get_color_mapping(column: str) -> dict:
@@ -63,8 +90,20 @@ def get_color_mapping(column: str) -> dict:
         return cmap_cbrew_equip
 
 
+def create_figure(figsize: tuple[float, float], pyplot: bool = True) -> tuple[Figure, plt.Axes]:
+    """
+    Create a figure with a single Axes. Figures created with `pyplot=False` are not registered
+    in pyplot's global figure manager and can therefore be rendered in separate threads.
+    """
+    if pyplot:
+        return plt.subplots(figsize=figsize)
+    
+    fig = Figure(figsize=figsize)
+    return fig, fig.subplots()
+
+
 def create_img_title(title: str):
-    return re.sub(r'[\s\W]+', '_', title.lower())[:-1]
+    return IMG_TITLE_PATTERN.sub('_', title.lower())[:-1]
 
 
 def parse_and_verify_dates(df: pd.DataFrame, 
@@ -87,12 +126,12 @@ def parse_and_verify_dates(df: pd.DataFrame,
         - end_date_str (str): The end date as a formatted string 'DD.MM.YYYY'.
     """
     # Timezone aware datetime objects are needed; otherwise DataFrame filtering would result in a TypeError
-    start_date = pd.to_datetime(start_date, dayfirst=True).tz_localize('GMT')
-    end_date = pd.to_datetime(end_date, dayfirst=True).tz_localize('GMT')
+    start_date = pd.to_datetime(start_date, dayfirst=True, utc=True)
+    end_date = pd.to_datetime(end_date, dayfirst=True, utc=True)
     
     # Adjust start date to the first of the month and end date to the last of the month
     start_date = start_date.replace(day=1)
-    end_date = end_date + pd.offsets.MonthEnd(0)
+    end_date = end_date + MONTH_END
     
     # Define datetime strings for easier plotting
     start_date_str = start_date.strftime('%d.%m.%Y')
@@ -107,7 +146,7 @@ def parse_and_verify_dates(df: pd.DataFrame,
         df_start_date = df_start_date.replace(day=1)
         
         # Adjust DataFrame end date to the last of the month
-        df_end_date = df_end_date + pd.offsets.MonthEnd(0)
+        df_end_date = df_end_date + MONTH_END
         
         if start_date < df_start_date:
             start_date = df_start_date
@@ -120,8 +159,70 @@ def parse_and_verify_dates(df: pd.DataFrame,
     return start_date, start_date_str, end_date, end_date_str
 
 
+def count_values(series: pd.Series) -> pd.Series:
+    """
+    Counts the values of a Series like `Series.value_counts`, but leaves out categories 
+    of categorical Series that do not occur.
+    """
+    counts = series.value_counts()
+    return counts[counts > 0]
+
+
+def aggregate_calendar(df: pd.DataFrame, func: str) -> pd.Series | pd.DataFrame:
+    """
+    Aggregates the event data of `df` for the given plotting function `func` 
+    (see `PLOT_FUNCS` for all available functions).
+    """
+    if func == 'organiser_detail':
+        return count_values(df['organiser_detail'])
+    
+    elif func == 'organiser':
+        return count_values(df['organiser'])
+    
+    elif func == 'event_category':
+        return count_values(df['event_category'])
+    
+    elif func == 'event_category_by_organiser':
+        result_counts = pd.crosstab(df['organiser'], df['event_category'])
+        
+        # Sort organisers by their total number of events
+        total_events = result_counts.sum(axis=1).sort_values(ascending=False)
+        return result_counts.loc[total_events.index]
+    
+    elif func == 'equip_details':
+        # Count the events per equipment column in a single NumPy reduction
+        equip_cols = list(EQUIP_COLUMNS.keys())
+        equip_counts = df[equip_cols].to_numpy(dtype=bool).sum(axis=0)
+        return pd.Series(equip_counts, index=equip_cols).sort_values(ascending=False)
+    
+    elif func == 'equip_overall':
+        return df['equip'].value_counts()
+    
+    elif func == 'participant_stats':
+        return (
+            df.groupby(['event_category'], observed=True)['participant_count']
+            .sum()
+            .sort_values(ascending=False)
+        )
+    
+    elif func == 'participants_per_month':
+        # Group by month start; months without any events are left out
+        participants_per_month = df.groupby(pd.Grouper(key='event_start', freq='MS'))['participant_count']
+        return participants_per_month.sum()[participants_per_month.size() > 0]
+
+
+def precompute_aggregates(df: pd.DataFrame, funcs: list[str] = PLOT_FUNCS) -> dict[str, pd.Series | pd.DataFrame]:
+    """
+    Aggregates the event data of `df` for several plotting functions at once. The returned dict 
+    can be passed to `plot_calendar` via the `aggregates` parameter.
+    """
+    return {func: aggregate_calendar(df, func) for func in funcs}
+
+
 def plot_calendar(df: pd.DataFrame = None, start_date: str = '01.01.2024', end_date: str  = '01.02.2024', 
-                  func: str = 'organiser', top_k: int = 10, streamlit: bool = False, list_func: bool = False):
+                  func: str = 'organiser', top_k: int = 10, streamlit: bool = False, list_func: bool = False,
+                  return_png: bool = False, prefiltered: bool = False, dpi: int = 300, 
+                  aggregates: dict[str, pd.Series | pd.DataFrame] = None):
     """
     Plots various types of visualizations based on the input event data within a specified date range.
     
@@ -150,10 +251,26 @@ def plot_calendar(df: pd.DataFrame = None, start_date: str = '01.01.2024', end_d
     list_func : bool, optional
         If True, prints the available plotting functions and returns without generating a plot.
         Default is False.
+    return_png : bool, optional
+        If True, the plot is neither shown nor passed to Streamlit nor saved; the rendered PNG is returned 
+        instead. The figure is not registered in pyplot, so plots can be rendered in parallel threads.
+        Default is False.
+    prefiltered : bool, optional
+        If True, `df` is expected to only contain events between `start_date` and `end_date` and is not 
+        filtered again. Default is False.
+    dpi : int, optional
+        The resolution of the saved plot image in dots per inch.
+        Default is 300.
+    aggregates : dict, optional
+        Precomputed aggregates of `df` as returned by `precompute_aggregates`. If given, the aggregate
+        for `func` is taken from it instead of being computed from `df`.
+        Default is None.
         
     Returns:
     --------
-    None or str
+    None, str or tuple[bytes, str]
+        If `return_png` is True, returns the PNG bytes and the file path of the plot image in `OUTPUT_DIR`
+        (e.g. for naming it in an archive) without saving it.
         If `streamlit` is True, returns the file path of the saved plot image.
         Otherwise, displays the plot using matplotlib.
     
@@ -178,39 +295,37 @@ def plot_calendar(df: pd.DataFrame = None, start_date: str = '01.01.2024', end_d
     --------
     >>> plot_calendar(df=events_df, start_date='01.01.2024', end_date='31.01.2024', func='organiser')
     """    
-    # Define available plotting functions
-    all_funcs = ['organiser', 
-                 'organiser_detail', 
-                 'event_category', 
-                 'event_category_by_organiser',
-                 'equip_details', 
-                 'equip_overall', 
-                 'participant_stats', 
-                 'participants_per_month']
-    
     if list_func:
-        print(f"Available plotting functions: {all_funcs}")
+        print(f"Available plotting functions: {PLOT_FUNCS}")
         return
         
-    if not func in all_funcs:
+    if not func in PLOT_FUNCS:
         print(f"Plotting function {func} not available. Check available functions by passing the 'list_func' parameter.")
         return
     
     # Parse dates and check if they exist in the DataFrame
     start_date, start_date_str, end_date, end_date_str = parse_and_verify_dates(df, start_date, end_date)
     
+    # Filter data for the given time period
+    if not prefiltered:
+        df = df[(df['event_start'] >= start_date) & (df['event_end'] <= end_date)]
+    
+    # Aggregate data for the selected plotting function
+    if aggregates is not None:
+        result_counts = aggregates[func]
+    else:
+        result_counts = aggregate_calendar(df, func)
+    
     # Define color map
     color_mapping = get_color_mapping('organiser')
     
     # Plot data for different functions
     if func == 'organiser_detail':
-        # Filter data
-        temp_df = df[(df['event_start'] >= start_date) & (df['event_end'] <= end_date)].copy()
-        result_counts = temp_df['organiser_detail'].value_counts().head(top_k)
-        result_counts = result_counts.sort_values(ascending=True)
+        result_counts = result_counts.head(top_k).sort_values(ascending=True)
         
-        # Get colors from map for key in dict
-        bar_colors = [color_mapping.get(df[df['organiser_detail'] == detail]['organiser'].iloc[0], '#333333') for detail in result_counts.index]
+        # Get colors from map for the organiser of each organiser_detail
+        detail_to_organiser = df.drop_duplicates('organiser_detail').set_index('organiser_detail')['organiser']
+        bar_colors = [color_mapping.get(detail_to_organiser.get(detail), '#333333') for detail in result_counts.index]
 
         # Define labels
         title = f"""Anzahl Veranstaltungen nach Veranstalterdetails (Top {top_k})
@@ -219,14 +334,12 @@ def plot_calendar(df: pd.DataFrame = None, start_date: str = '01.01.2024', end_d
         ylabel = 'Veranstalterdetails'
     
     elif func == 'organiser':
-        result_counts = df[(df['event_start'] >= start_date) & (df['event_end'] <= end_date)]['organiser'].value_counts()
         bar_colors = [color_mapping.get(cat, '#333333') for cat in result_counts.index]
         title = f"Anzahl Veranstaltungen nach Veranstaltern ({start_date_str} bis {end_date_str}) | n={result_counts.values.sum()}"
         xlabel = 'Veranstalter'
         ylabel = 'Anzahl Veranstaltungen'
       
     elif func == 'event_category':
-        result_counts = df[(df['event_start'] >= start_date) & (df['event_end'] <= end_date)]['event_category'].value_counts()
         color_mapping = get_color_mapping('event_category')
         bar_colors = [color_mapping.get(cat, '#333333') for cat in result_counts.index]
         title = f"Anzahl Veranstaltungen nach Veranstaltungstyp ({start_date_str} bis {end_date_str}) | n={result_counts.values.sum()}"
@@ -234,13 +347,6 @@ def plot_calendar(df: pd.DataFrame = None, start_date: str = '01.01.2024', end_d
         ylabel = 'Anzahl Veranstaltungen'
     
     elif func == 'event_category_by_organiser':
-        # Filter data
-        temp_df = df[(df['event_start'] >= start_date) & (df['event_end'] <= end_date)].copy()
-        result_counts = temp_df.groupby(['organiser', 'event_category']).size().unstack(fill_value=0)
-        result_counts['total_events'] = result_counts.sum(axis=1)
-        result_counts = result_counts.sort_values(by='total_events', ascending=False)
-        result_counts = result_counts.drop('total_events', axis=1)
-        
         # Define color mapping
         color_mapping = get_color_mapping(column='event_category')
         bar_colors = [color_mapping.get(cat, '#333333') for cat in result_counts.columns]
@@ -251,22 +357,6 @@ def plot_calendar(df: pd.DataFrame = None, start_date: str = '01.01.2024', end_d
         ylabel = 'Anzahl Veranstaltungen'
         
     elif func == 'equip_details':        
-        # Filter data
-        equip_cols = {
-            'equip_clevertouch': 'Clevertouch',
-            'equip_dt': 'Design Thinking',
-            'equip_eyetracking': 'Eye Tracking',
-            'equip_monitor': 'Präsentationsmonitor',
-            'equip_vr': 'VR'
-        }    
-        
-        result_counts = (
-            df
-            [(df['event_start'] >= start_date) & (df['event_end'] <= end_date)][list(equip_cols.keys())]
-            .sum()
-            .sort_values(ascending=False)
-            )
-        
         # Define color mapping
         color_mapping = get_color_mapping('equip')
         bar_colors = [color_mapping.get(key, '#333333') for key in color_mapping]
@@ -278,19 +368,12 @@ def plot_calendar(df: pd.DataFrame = None, start_date: str = '01.01.2024', end_d
 ‡ Nutzung mehrerer Tools pro Veranstaltung möglich"""
         
     elif func == 'equip_overall':
-        result_counts = df[(df['event_start'] >= start_date) & (df['event_end'] <= end_date)]['equip'].value_counts()        
         bar_colors = ['#e5c494', '#b3b3b3']
         title = f"Toolnutzung in Veranstaltungen\n({start_date_str} bis {end_date_str}) | n={result_counts.values.sum()}"
         ylabel = 'Anzahl Veranstaltungen'
         xlabel = 'Toolnutzung'
         
     elif func == 'participant_stats':
-        result_counts = (
-            df[(df['event_start'] >= start_date) & (df['event_end'] <= end_date)]
-            .groupby(['event_category'])['participant_count']
-            .sum()
-            .sort_values(ascending=False)
-        )
         color_mapping = get_color_mapping('event_category')
         bar_colors = [color_mapping.get(key, '#333333') for key in result_counts.index]
         title = f"Anzahl Teilnehmende nach Veranstaltungstyp ({start_date_str} bis {end_date_str})‡ | n={result_counts.values.sum()}"
@@ -299,10 +382,6 @@ def plot_calendar(df: pd.DataFrame = None, start_date: str = '01.01.2024', end_d
         ylabel = 'Anzahl Teilnehmende'
         
     elif func == 'participants_per_month':
-        result_counts = (
-            df.groupby([df['event_start'].dt.year, df['event_start'].dt.month])['participant_count']
-            .sum()
-            )
         bar_colors = ['#e5c494']
         title = f"Anzahl Teilnehmende pro Monat ({start_date_str} bis {end_date_str})‡ | n={result_counts.values.sum()}"
         xlabel = f"""Monat\n
@@ -311,73 +390,86 @@ def plot_calendar(df: pd.DataFrame = None, start_date: str = '01.01.2024', end_d
         
     # Plot data
     if func in ['organiser', 'event_category', 'equip_details', 'participant_stats', 'participants_per_month']:
-        plt.figure(figsize=(10, 8))
-        plt.grid(True, which='both', linestyle='-', linewidth=0.2)
+        fig, ax = create_figure(figsize=(10, 8), pyplot=not return_png)
+        ax.grid(True, which='both', linestyle='-', linewidth=0.2)
         
-        bars = plt.bar(list(range(1, len(result_counts) + 1)), result_counts.values, color=bar_colors)
+        bars = ax.bar(list(range(1, len(result_counts) + 1)), result_counts.values, color=bar_colors)
         for bar in bars:
             bar_height = bar.get_height()
-            plt.text(bar.get_x() + bar.get_width()/2, bar_height, int(bar_height), ha='center', va='bottom')
+            ax.text(bar.get_x() + bar.get_width()/2, bar_height, int(bar_height), ha='center', va='bottom')
         
         # xticks
         if func in ['equip_details']:
-            plt.xticks(ticks=list(range(1, len(result_counts) + 1)), labels=[equip_cols[key] for key in result_counts.index], rotation=0, ha='center') 
+            ax.set_xticks(ticks=list(range(1, len(result_counts) + 1)), labels=[EQUIP_COLUMNS[key] for key in result_counts.index], rotation=0, ha='center') 
         elif func in ['participant_stats', 'event_category', 'organiser']:
-            plt.xticks(ticks=list(range(1, len(result_counts) + 1)), labels=result_counts.index, rotation=0, ha='center') 
+            ax.set_xticks(ticks=list(range(1, len(result_counts) + 1)), labels=result_counts.index, rotation=0, ha='center') 
         else:
-            plt.xticks(ticks=list(range(1, len(result_counts) + 1)), labels=result_counts.index, rotation=45, ha='right') 
+            ax.set_xticks(ticks=list(range(1, len(result_counts) + 1)), labels=result_counts.index.strftime('%m.%Y'), rotation=45, ha='right') 
     
     elif func in ['organiser_detail']:    
-        plt.figure(figsize=(12, 8))
-        plt.grid(True, which='both', linestyle='-', linewidth=0.2)
-        bars = plt.barh(list(range(1, len(result_counts) + 1)), result_counts.values, color=bar_colors)
+        fig, ax = create_figure(figsize=(12, 8), pyplot=not return_png)
+        ax.grid(True, which='both', linestyle='-', linewidth=0.2)
+        bars = ax.barh(list(range(1, len(result_counts) + 1)), result_counts.values, color=bar_colors)
         for bar in bars:
             bar_width = bar.get_width()
-            plt.text(bar_width + 0.1, bar.get_y() + bar.get_height() / 2, int(bar_width), ha='left', va='center')
-        plt.yticks(ticks=list(range(1, len(result_counts) + 1)), labels=result_counts.index)
-        plt.ylim(0.3, len(result_counts) + 0.7)
+            ax.text(bar_width + 0.1, bar.get_y() + bar.get_height() / 2, int(bar_width), ha='left', va='center')
+        ax.set_yticks(ticks=list(range(1, len(result_counts) + 1)), labels=result_counts.index)
+        ax.set_ylim(0.3, len(result_counts) + 0.7)
         
     elif func in ['event_category_by_organiser']:
-        ax = result_counts.plot(kind='bar', stacked=False, figsize=(12, 8), color=bar_colors)
-        plt.grid(True, which='both', linestyle='-', linewidth=0.2)
+        fig, ax = create_figure(figsize=(12, 8), pyplot=not return_png)
+        result_counts.plot(kind='bar', stacked=False, ax=ax, color=bar_colors)
+        ax.grid(True, which='both', linestyle='-', linewidth=0.2)
         for container in ax.containers:
             ax.bar_label(container)
-        plt.xticks(rotation=0, ha='center')
+        plt.setp(ax.get_xticklabels(), rotation=0, ha='center')
         
     elif func in ['equip_overall']:
-        plt.figure(figsize=(6, 9))
-        plt.grid(True, which='both', linestyle='-', linewidth=0.2)
-        bars = plt.bar(list(range(1, len(result_counts) + 1)), result_counts.values, color=bar_colors)
+        fig, ax = create_figure(figsize=(6, 9), pyplot=not return_png)
+        ax.grid(True, which='both', linestyle='-', linewidth=0.2)
+        bars = ax.bar(list(range(1, len(result_counts) + 1)), result_counts.values, color=bar_colors)
         for bar in bars:
             bar_height = bar.get_height()
-            plt.text(bar.get_x() + bar.get_width()/2, bar_height, int(bar_height), ha='center', va='bottom')
-        plt.xticks(ticks=list(range(1, len(result_counts) + 1)), labels=['Toolnutzung', 'Keine Toolnutzung'], rotation=0, ha='center') 
-        plt.xlim(0.5, len(result_counts) + 0.5)
+            ax.text(bar.get_x() + bar.get_width()/2, bar_height, int(bar_height), ha='center', va='bottom')
+        ax.set_xticks(ticks=list(range(1, len(result_counts) + 1)), labels=['Toolnutzung', 'Keine Toolnutzung'], rotation=0, ha='center') 
+        ax.set_xlim(0.5, len(result_counts) + 0.5)
         
     # Plot labels
-    plt.title(title, weight='bold', fontsize=13, pad=10)
-    plt.xlabel(xlabel, weight='bold', labelpad=25)
-    plt.ylabel(ylabel, weight='bold', labelpad=10)
+    ax.set_title(title, weight='bold', fontsize=13, pad=10)
+    ax.set_xlabel(xlabel, weight='bold', labelpad=25)
+    ax.set_ylabel(ylabel, weight='bold', labelpad=10)
     
     # Plot legends
     if func == 'organiser_detail':
         handles = [plt.Rectangle((0,0),1,1, color=color_mapping[key]) for key in color_mapping]    
         labels = color_mapping.keys()
-        plt.legend(handles, labels, title="Veranstalter", loc='lower right')
+        ax.legend(handles, labels, title="Veranstalter", loc='lower right')
         
     elif func in ['event_category_by_organiser']:
-        plt.legend(title='Veranstaltungstyp')    
+        ax.legend(title='Veranstaltungstyp')    
     
     # Tight layout
-    plt.tight_layout()
+    fig.tight_layout()
     
-    # Save and show plot
+    # Render plot
     img_title = create_img_title(title)
-    plt.savefig(f"{str(output_dir.joinpath(img_title))}", dpi=300, bbox_inches='tight')
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', dpi=dpi, bbox_inches='tight')
+    png_bytes = buffer.getvalue()
+    
+    # Return the rendered plot without displaying or saving it
+    if return_png:
+        return png_bytes, f"{Path(OUTPUT_DIR).joinpath(img_title)}.png"
+    
+    # Save and show plot
+    img_path = f"{set_output_dir().joinpath(img_title)}.png"
+    with open(img_path, 'wb') as fout:
+        fout.write(png_bytes)
     
     # If running the function via the streamlit app use st.pyplot()
     if streamlit:
-        st.pyplot(plt)
-        return f"{output_dir.joinpath(img_title)}.png"
+        st.pyplot(fig)
+        plt.close(fig)
+        return img_path
     
-    plt.show() 
\ No newline at end of file
+    plt.show()
\ No newline at end of file
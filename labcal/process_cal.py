@@ -1,12 +1,59 @@
+import io
 import re
 import pandas as pd
 import warnings
-from ics import Calendar
+from functools import lru_cache
+from dateutil.tz import tzical
+from ics import Calendar, Event
+from ics.grammar.parse import ContentLine
+from ics.utils import iso_precision, iso_to_arrow, parse_duration, uid_gen, unescape_string
 from pathlib import Path
 
 
 warnings.filterwarnings("ignore", category=FutureWarning)
 
+# Format of UTC date-time values in iCalendar files
+ICS_DATETIME_FORMAT = '%Y%m%dT%H%M%SZ'
+
+# Precompiled patterns for splitting content lines (NAME;PARAM=VALUE:VALUE) of iCalendar files
+CONTENT_LINE_PATTERN = re.compile(r'([A-Za-z0-9-]+)((?:;[A-Za-z0-9-]+=(?:"[^"]*"|[^";:,]*)(?:,(?:"[^"]*"|[^";:,]*))*)*):(.*)')
+PARAM_PATTERN = re.compile(r';([A-Za-z0-9-]+)=((?:"[^"]*"|[^";:,]*)(?:,(?:"[^"]*"|[^";:,]*))*)')
+PARAM_VALUES_PATTERN = re.compile(r'"[^"]*"|[^",]+')
+
+# Precompiled patterns for splitting event descriptions
+COLON_OR_WHITESPACE_PATTERN = re.compile(r':|\s')
+CATEGORY_SPLIT_PATTERN = re.compile(r':|,')
+ORGANISER_SPLIT_PATTERN = re.compile(r':')
+DIGITS_PATTERN = re.compile(r'\d+')
+PARTICIPANTS_PATTERN = re.compile(r'^[^-]*-\s*(\d+)|^[^-]*?(\d+)[^-]*$')
+ITEM_KIND_PATTERN = re.compile(r'^(Kategorie|Veranstalter|Teilnehmer|Technik|Catering|Anmerkung)')
+
+# Columns created from the processed event descriptions
+DESCRIPTION_COLUMNS = ['event_category', 'event_description', 'organiser', 'organiser_detail', 'participant_count', 
+                       'equip', 'equip_vr', 'equip_eyetracking', 'equip_clevertouch', 'equip_dt', 'equip_monitor', 
+                       'catering', 'notes']
+
+# Keywords for detecting the equipment needed for an event
+EQUIPMENT_PATTERNS = {
+    'equipment_vr': ['vr', 
+                     'virtual'],
+    'equipment_eye_tracking': ['eye', 
+                               'tracking'],
+    'equipment_clevertouch': ['clever', 
+                              'mobiler'],
+    'equipment_large_monitor': ['praesentations', 
+                                'großer monitor', 
+                                'präsentations'],
+    'equipment_design_thinking': ['dt', 
+                                  'design thinking', 
+                                  'thinking']
+}
+
+# One capturing group per keyword group; the lookahead finds matches of all groups even if they overlap
+EQUIPMENT_PATTERN = re.compile('(?=' + '|'.join(
+    f"({'|'.join(re.escape(key) for key in keys)})" for keys in EQUIPMENT_PATTERNS.values()
+    ) + ')')
+
 
 def load_and_parse_calendar(filepath: str) -> Calendar:
     """
@@ -15,53 +62,151 @@ def load_and_parse_calendar(filepath: str) -> Calendar:
     # Create Path object from filepath string
     cal_filepath = Path(filepath)
 
-    # Open the file
-    with open(cal_filepath, 'r', encoding='utf-8') as fin:
-        cal_raw = fin.read()
+    # Read the file as bytes and decode it at once; the CRLF line endings are handled by the parser
+    with open(cal_filepath, 'rb') as fin:
+        cal_raw = fin.read().decode('utf-8')
         
     # Return the parsed Calendar object
     return Calendar(cal_raw)
 
 
-def streamlit_load_and_parse_calendar(file) -> Calendar:
-    return Calendar(file)
+def clean_event_data(value: str) -> str:
+    """
+    Clean a str value of an event and remove various chars and whitespaces.
+    """
+    # Set '¶' as stop char for splitting in proces_description()
+    return value.replace('\r', '').replace('\n', '¶').replace('\\', '').strip()
 
 
-def parse_event(event: list[str]) -> dict:
+def parse_event(event: Event) -> dict:
     """
-    Parse a serialized event from a Calendar object and return the event as a dict.
+    Read the relevant attributes of an Event from a Calendar object and return the event as a dict.
+    Only attributes that are set on the event are included.
     """
-    event_dict = {}
+    event_dict = {'UID': event.uid}
+    
+    if event.name:
+        event_dict['SUMMARY'] = clean_event_data(event.name)
+    if event.description:
+        event_dict['DESCRIPTION'] = clean_event_data(event.description)
+        
+    # All-day events have no start and end time
+    if event.begin and not event.all_day:
+        event_dict['DTSTART'] = event.begin.to('utc').strftime(ICS_DATETIME_FORMAT)
+        if event.has_end():
+            event_dict['DTEND'] = event.end.to('utc').strftime(ICS_DATETIME_FORMAT)
     
-    for item in event:
-        if ':' in item:
-            key, value = item.split(':', 1)
-            event_dict[key] = value
+    # CREATED is not parsed by ics and only kept as raw content line
+    for line in event.extra:
+        if line.name == 'CREATED':
+            event_dict['CREATED'] = line.value.strip()
+            break
             
     return event_dict
 
 
-def clean_event_data(event: list[str]) -> list:
+def parse_ics_fast(text: str) -> list[dict]:
     """
-    Clean a split str event and remove various chars and whitespaces.
+    Lightweight alternative to parsing an iCalendar (.ics) str with a Calendar object and `parse_event`.
+    
+    Scans the lines of the calendar and returns the relevant attributes of all events (VEVENT blocks) as a 
+    list of dicts in the same format as `parse_event`, without building the Calendar and its Event objects. 
+    Dates with a TZID are converted to UTC in the same way as by the ics library.
+    
+    Args:
+        `text (str)`: The content of an iCalendar (.ics) file.
+        
+    Returns:
+        list[dict]: A list with one dict of UID, SUMMARY, DESCRIPTION, DTSTART, DTEND and CREATED per event.
     """
-    clean_event = []
+    def parse_params(params: str) -> dict[str, list[str]]:
+        return {
+            name: [value[1:-1] if value.startswith('"') else value for value in PARAM_VALUES_PATTERN.findall(values)]
+            for name, values in PARAM_PATTERN.findall(params)
+            }
+    
+    def parse_date(name: str, event_lines: dict, timezones: dict):
+        params, value = event_lines[name]
+        return iso_to_arrow(ContentLine(name, parse_params(params), value), timezones)
+    
+    def read_event(event_lines: dict, timezones: dict) -> dict:
+        event_dict = {'UID': event_lines['UID'][1] if 'UID' in event_lines else uid_gen()}
+        
+        for name in ['SUMMARY', 'DESCRIPTION']:
+            if name in event_lines:
+                value = unescape_string(event_lines[name][1])
+                if value:
+                    event_dict[name] = clean_event_data(value)
+        
+        # All-day events have no start and end time
+        if 'DTSTART' in event_lines and iso_precision(event_lines['DTSTART'][1]) != 'day':
+            begin = parse_date('DTSTART', event_lines, timezones)
+            event_dict['DTSTART'] = begin.to('utc').strftime(ICS_DATETIME_FORMAT)
+            
+            if 'DTEND' in event_lines:
+                event_dict['DTEND'] = parse_date('DTEND', event_lines, timezones).to('utc').strftime(ICS_DATETIME_FORMAT)
+            elif 'DURATION' in event_lines:
+                end = begin + parse_duration(event_lines['DURATION'][1])
+                event_dict['DTEND'] = end.to('utc').strftime(ICS_DATETIME_FORMAT)
+                
+        if 'CREATED' in event_lines:
+            event_dict['CREATED'] = event_lines['CREATED'][1].strip()
+            
+        return event_dict
+    
+    # Unfold lines that are continued by a leading space or tab on the next line
+    lines = []
+    for line in text.split('\n'):
+        if not line.strip():
+            continue
+        elif lines and line[0] in (' ', '\t'):
+            lines[-1] += line[1:].strip('\r')
+        else:
+            lines.append(line.strip('\r'))
     
-    for line in event:
-        event = re.sub(r'\r', '', line)
-        event = re.sub(r'\\n', '¶', event) # set '¶' as stop char for splitting in proces_description()
-        event = re.sub(r'\\', '', event)
-        clean_event.append(event.strip())
+    # Collect the (params, value) of all properties of every event and the lines of all VTIMEZONE blocks
+    events = []
+    timezone_lines = []
+    components = []
+    
+    for line in lines:
+        content_line = CONTENT_LINE_PATTERN.match(line)
+        if not content_line:
+            continue
+        
+        name, params, value = content_line.groups()
+        name = name.upper()
+        
+        if name == 'BEGIN':
+            components.append(value.upper())
+            if components[-1] == 'VEVENT':
+                event_lines = {}
+        elif name == 'END':
+            if components and components.pop() == 'VEVENT':
+                events.append(event_lines)
+        # Skip the properties of components within an event (e.g. VALARM)
+        elif components and components[-1] == 'VEVENT':
+            event_lines.setdefault(name, (params, value))
+            
+        # tzical does not understand X- and SEQUENCE lines
+        if ('VTIMEZONE' in components or line.upper() == 'END:VTIMEZONE') and not (name.startswith('X-') or name == 'SEQUENCE'):
+            timezone_lines.append(line)
+    
+    # Time zones defined in the calendar are used for TZIDs that are unknown to the system
+    timezones = {}
+    if timezone_lines:
+        calendar_timezones = tzical(io.StringIO('\r\n'.join(timezone_lines)))
+        timezones = {key: calendar_timezones.get(key) for key in calendar_timezones.keys()}
         
-    return clean_event
+    return [read_event(event_lines, timezones) for event_lines in events]
 
 
 def create_dataframe_from_calendar(cal: Calendar, verbose: bool = False) -> pd.DataFrame:
     """
     Converts events from a given Calendar object into a pandas DataFrame.
 
-    This function processes events from a Calendar object by serializing and cleaning the event data,
-    parsing the cleaned data into a dictionary format, and then converting that dictionary into a pandas DataFrame.
+    This function reads and cleans the relevant attributes of the events from a Calendar object into a dictionary 
+    format, and then converts the list of dictionaries into a pandas DataFrame.
     Optionally, it can print detailed processing information if the verbose flag is set to True.
 
     Parameters:
@@ -79,56 +224,25 @@ def create_dataframe_from_calendar(cal: Calendar, verbose: bool = False) -> pd.D
         print(f'=================')
         print(f'First item of calendar_data:\n')
         for event in calendar_data[:1]:
-            event_string = '\n'.join(event)
+            event_string = '\n'.join(f'{key}:{value}' for key, value in event.items())
             print(f"{event_string}\n")
         print(f'Found {len(columns)} keys/columns: {columns}')
         print(f'\nLENGTH OF LISTS AND DICTS')
         print(f'-------------------------')
         print(f'calendar.events count: {len(cal.events)}')
         print(f'calendar_data count: {len(calendar_data)}')
-        for key in calendar_dict.keys():
-            max_length = 0
-            if max_length < len(calendar_dict[key]):
-                max_length = len(calendar_dict[key])
-        print(f'max. calendar_dict count: {max_length}')
-        print(f'\nCALENDAR_DICT:')
-        print(f'--------------')
-        for key in calendar_dict.keys():
-            print(f'{key}: {calendar_dict[key]}')        
-    
-    # Create list from Calendar.events and clean resulting event strings
-    calendar_data = []
-    for event in cal.events:
-        event_lines = event.serialize().split('\n')
-        clean_event = clean_event_data(event_lines)
-        calendar_data.append(clean_event)
-    
-    # Parse cleaned calendar_data and return a dict with all relevant keys for each event (BEGIN, CREATED ...)
-    parsed_events = [parse_event(event) for event in calendar_data]
-    
-    # Create a set of unique dict.keys() that will be the columns of the DataFrame
-    columns = set()
-    for event in parsed_events:
-        columns.update(event.keys())
-        
-    # Create a new calendar_dict with those columns as keys
-    calendar_dict = {}
-    for col in columns:
-        if not col in calendar_dict:
-            calendar_dict[col] = []
-            
-    # Populate the dict with the values of parsed_events
-    for event in parsed_events:
-        for key in calendar_dict.keys():
-            # If column key of calendar_dict is found in parsed_event append parsed_event value
-            if key in event.keys():
-                calendar_dict[key].append(event[key])
-            # Else append None
-            else:
-                calendar_dict[key].append(None)
+        print(f'DataFrame row count: {len(df)}')
+        print(f'\nDATAFRAME COLUMNS:')
+        print(f'------------------')
+        for col in columns:
+            print(f'{col}: {df[col].tolist()}')        
+    
+    # Read the relevant attributes (UID, SUMMARY, DTSTART ...) of all Calendar.events
+    calendar_data = [parse_event(event) for event in cal.events]
     
-    # Create pd.DataFrame from calendar_dict
-    df = pd.DataFrame(calendar_dict)
+    # Create pd.DataFrame from calendar_data; keys missing in an event are filled with NaN
+    df = pd.DataFrame.from_records(calendar_data)
+    columns = df.columns.tolist()
 
     # Print processing stats if verbose flag is True
     if verbose:
@@ -137,7 +251,84 @@ def create_dataframe_from_calendar(cal: Calendar, verbose: bool = False) -> pd.D
     return df
 
 
-def process_description(series: list[str], verbose: bool = False) -> pd.Series:    
+@lru_cache(maxsize=2048)
+def clean_event_category(event_category: str) -> str:
+    """
+    Map different variations of an event category to the same category.
+    """
+    patterns = {
+        'Interne Veranstaltung': ['interne veran', 
+                                  'ub intern'],
+        'Führung': ['veranstaltung/führung'],
+        'Lehrveranstaltung': ['seminar'],
+        'Workshop': ['vr-einführung']
+        }
+    
+    for clean_string, keys in patterns.items():
+        if any(key in event_category.lower() for key in keys):
+            return clean_string
+        
+    return event_category
+
+
+@lru_cache(maxsize=2048)
+def clean_organiser(organiser: str) -> str:
+    """
+    Map different variations of an organiser to the same organiser.
+    """
+    patterns = {
+        'UB': ['ub'],
+        'Uni': ['uni'],
+        }
+    
+    for clean_string, keys in patterns.items():
+        if any(key in organiser.lower() for key in keys):
+            return clean_string
+        
+    return organiser
+
+
+@lru_cache(maxsize=2048)
+def clean_organiser_detail(organiser_detail: str) -> str:
+    """
+    Main mapping dictionary to map different name variations to the same key.
+    """
+    patterns = {
+        'Institut für Sport': ['sport'],
+        'Social Science': ['sowi', 
+                           'social science', 
+                           'powi'],
+        'BWL': ['ls bwl', 
+                'wirtschaftspädag',
+                'sales services'],
+        'Jura': ['fak jura', 
+                 'rechtswissenschaft'],
+        'Wirtschaftsinformatik': ['wirtschaftsinformatik'],
+        'Philosophische Fakultät': ['philosophische', 
+                                    'phil fak',
+                                    'philfak',
+                                    'anglistik',
+                                    'germanistik'],
+        'Stud.-Initiative X': ['student group x'],
+        'Stud.-Initiative Y': ['student group y'],
+        'Stud.-Initiative Z': ['student group z'],
+        'Universitäts-IT': ['uni it'],
+        'Universitätsbibliothek': ['explab', 
+                                   'ub',
+                                   'fdz'],
+        'Uni Verwaltung': ['verwaltung'],
+        'Fachschaftsrat': ['fsr', 
+                           'fachschaftsr']
+        }
+    
+    for clean_string, keys in patterns.items():
+        if any(key in organiser_detail.lower() for key in keys):
+            return clean_string
+        
+    return organiser_detail
+
+
+def process_description(series: list[str], verbose: bool = False) -> tuple:    
     """
     Processes a list of event description strings, extracting and cleaning various details about each event.
     If `verbose` is True prints all strings that could not be cleaned.
@@ -146,7 +337,7 @@ def process_description(series: list[str], verbose: bool = False) -> pd.Series:
         `series (list[str])`: A list of strings containing event description details.
         
     Returns:
-        pd.Series: A pandas Series containing cleaned and extracted event details, which includes:
+        tuple: A tuple containing cleaned and extracted event details, which includes:
         `event_category (str)`: The category of the event.
         `event_description (str)`: A detailed description of the event.
         `organiser (str)`: The main organiser of the event.
@@ -181,127 +372,24 @@ def process_description(series: list[str], verbose: bool = False) -> pd.Series:
         split_item = item.split(' ', maxsplit=1)
         return split_item[1].strip() if len(split_item) > 1 else None
      
-    def clean_event_category(event_category: str) -> str:
-        patterns = {
-        'Interne Veranstaltung': ['interne veran', 
-                                  'ub intern'],
-        'Führung': ['veranstaltung/führung'],
-        'Lehrveranstaltung': ['seminar'],
-        'Workshop': ['vr-einführung']
-         }
+    def clean_equipment(equipment_split: list[str]) -> dict[str: bool]:
+        # Find the index of every keyword group matching the joined equipment items in a single scan
+        matched_groups = {match.lastindex for match in EQUIPMENT_PATTERN.finditer(','.join(equipment_split).lower())}
         
-        for clean_string, keys in patterns.items():
-            if any(key in event_category.lower() for key in keys):
-                return clean_string
-            
-        return event_category
-    
-    def clean_organiser(organiser: str) -> str:
-        patterns = {
-            'UB': ['ub'],
-            'Uni': ['uni'],
-         }
-        
-        for clean_string, keys in patterns.items():
-            if any(key in organiser.lower() for key in keys):
-                return clean_string
-            
-        return organiser
-     
-    def clean_organiser_detail(organiser_detail: str) -> str:
-        """
-        Main mapping dictionary to map different name variations to the same key.
-        """
-        patterns = {
-        'Institut für Sport': ['sport'],
-        'Social Science': ['sowi', 
-                 'social science', 
-                 'powi'],
-        'BWL': ['ls bwl', 
-                'wirtschaftspädag',
-                'sales services'],
-        'Jura': ['fak jura', 
-                 'rechtswissenschaft'],
-        'Wirtschaftsinformatik': ['wirtschaftsinformatik'],
-        'Philosophische Fakultät': ['philosophische', 
-                                    'phil fak',
-                                    'philfak',
-                                    'anglistik',
-                                    'germanistik'],
-        'Stud.-Initiative X': ['student group x'],
-        'Stud.-Initiative Y': ['student group y'],
-        'Stud.-Initiative Z': ['student group z'],
-        'Universitäts-IT': ['uni it'],
-        'Universitätsbibliothek': ['explab', 
-                                   'ub',
-                                   'fdz'],
-        'Uni Verwaltung': ['verwaltung'],
-        'Fachschaftsrat': ['fsr', 
-                           'fachschaftsr']
-         }
-        
-        for clean_string, keys in patterns.items():
-            if any(re.search(key, organiser_detail.lower()) for key in keys):
-                return clean_string
-         
-        return organiser_detail
-    
-    def clean_equipment(equipment_split: list[str]) -> dict[str: bool]:        
-        patterns = {
-            'equipment_vr': ['vr', 
-                             'virtual'],
-            'equipment_eye_tracking': ['eye', 
-                                       'tracking'],
-            'equipment_clevertouch': ['clever', 
-                                      'mobiler'],
-            'equipment_large_monitor': ['praesentations', 
-                                        'großer monitor', 
-                                        'präsentations'],
-            'equipment_design_thinking': ['dt', 
-                                          'design thinking', 
-                                          'thinking']
-        }
-        
-        equipment_vr = False
-        equipment_eye_tracking = False
-        equipment_clevertouch = False
-        equipment_large_monitor = False
-        equipment_design_thinking = False
-        
-        for item in equipment_split:
-            for var, keys in patterns.items():
-                if any(key in item.lower() for key in keys):
-                    if var == 'equipment_vr':
-                        equipment_vr = True
-                    elif var == 'equipment_eye_tracking':
-                        equipment_eye_tracking = True
-                    elif var == 'equipment_clevertouch':
-                        equipment_clevertouch = True
-                    elif var ==  'equipment_large_monitor':
-                        equipment_large_monitor = True
-                    elif var == 'equipment_design_thinking':
-                        equipment_design_thinking = True
-
-        return {
-            'equipment_vr': equipment_vr,
-            'equipment_eye_tracking': equipment_eye_tracking,
-            'equipment_clevertouch': equipment_clevertouch,
-            'equipment_large_monitor': equipment_large_monitor,
-            'equipment_design_thinking': equipment_design_thinking
-        }
+        return {var: idx in matched_groups for idx, var in enumerate(EQUIPMENT_PATTERNS, start=1)}
     
     # Check if series is a list
     if isinstance(series, list):  
         for item in series:
             
-            # Check if item of list is not None and a string
-            if pd.notna(item) and isinstance(item, str):  
+            # Check if item of list is a string (this also skips None and NaN)
+            if isinstance(item, str):
                 
                 ### Process "Kategorie" items
                 if item.startswith('Kategorie'):
                     result = split_item(item)
-                    if result and re.search(r':|\s', result):
-                        event_category_split = re.split(r':|,', result, maxsplit=1)
+                    if result and COLON_OR_WHITESPACE_PATTERN.search(result):
+                        event_category_split = CATEGORY_SPLIT_PATTERN.split(result, maxsplit=1)
                         
                         # Check if event_category_split contains more than 1 item
                         if len(event_category_split) > 1:
@@ -315,8 +403,8 @@ def process_description(series: list[str], verbose: bool = False) -> pd.Series:
                 ### Process "Veranstalter" items    
                 elif item.startswith('Veranstalter'):
                     result = split_item(item)
-                    if result and re.search(r':|\s', result):
-                        organiser_split = re.split(r':', result, maxsplit=1)
+                    if result and COLON_OR_WHITESPACE_PATTERN.search(result):
+                        organiser_split = ORGANISER_SPLIT_PATTERN.split(result, maxsplit=1)
 
                         # Divide organiser_split in separate variables if it contains != 1 item
                         if len(organiser_split) != 1:
@@ -343,11 +431,11 @@ def process_description(series: list[str], verbose: bool = False) -> pd.Series:
                         # If string contains '-' (e.g. 10-20) split it and match all digits after '-'
                         if result and '-' in result:
                             participant_split = result.split('-')
-                            participant_count = re.match(r'\d+', participant_split[1].strip()).group(0)
+                            participant_count = DIGITS_PATTERN.match(participant_split[1].strip()).group(0)
 
                         # If no '-' is found try only matching digits; else set participant_count to None
                         else:
-                            participant_search = re.search(r'\d+', result)
+                            participant_search = DIGITS_PATTERN.search(result)
                             if participant_search:
                                 participant_count = participant_search.group(0)
                             else:
@@ -368,7 +456,7 @@ def process_description(series: list[str], verbose: bool = False) -> pd.Series:
                         
                     if equipment_split:
                         equipment_dict = clean_equipment(equipment_split)
-                        equipment = True if True in equipment_dict.values() else False
+                        equipment = any(equipment_dict.values())
                         equipment_vr = equipment_dict['equipment_vr']
                         equipment_eye_tracking = equipment_dict['equipment_eye_tracking']
                         equipment_clevertouch = equipment_dict['equipment_clevertouch']
@@ -391,9 +479,113 @@ def process_description(series: list[str], verbose: bool = False) -> pd.Series:
                     else:
                         notes = None
                         
-    return pd.Series([event_category, event_description, organiser, organiser_detail, participant_count,
-                      equipment, equipment_vr, equipment_eye_tracking, equipment_clevertouch, 
-                      equipment_design_thinking, equipment_large_monitor, catering, notes])
+    return (event_category, event_description, organiser, organiser_detail, participant_count,
+            equipment, equipment_vr, equipment_eye_tracking, equipment_clevertouch, 
+            equipment_design_thinking, equipment_large_monitor, catering, notes)
+
+
+def process_descriptions(desc_lists: pd.Series, verbose: bool = False) -> pd.DataFrame:
+    """
+    Vectorized version of `process_description` for the event description lists of all events.
+    The description items of all events are processed at once with pandas string methods.
+    Events with more than one item of the same kind (e.g. two "Teilnehmer" items) depend on 
+    the order of their items and are processed with `process_description` instead.
+    
+    Args:
+        `desc_lists (pd.Series)`: A Series with a list of event description strings per event.
+        `verbose (bool)`: Passed on to `process_description`. Default is False.
+        
+    Returns:
+        pd.DataFrame: A DataFrame with the same index as `desc_lists` and the cleaned and extracted 
+        event details of `process_description` as `DESCRIPTION_COLUMNS`.
+    """
+    # Events can only be matched with their description items by a unique index
+    if not desc_lists.index.is_unique:
+        return pd.DataFrame([process_description(x, verbose=verbose) for x in desc_lists], 
+                            index=desc_lists.index, columns=DESCRIPTION_COLUMNS)
+    
+    # Create a Series with one description item per row and the index of its event
+    items = desc_lists.explode().dropna().astype(object)
+    item_kind = items.str.extract(ITEM_KIND_PATTERN, expand=False)
+    
+    # Find events with repeated item kinds and exclude them from the vectorized processing
+    kind_counts = item_kind.groupby([item_kind.index, item_kind]).size()
+    fallback_idx = kind_counts[kind_counts > 1].index.get_level_values(0).unique()
+    
+    items = items[~items.index.isin(fallback_idx)]
+    item_kind = item_kind[~item_kind.index.isin(fallback_idx)]
+    
+    # Text after the first whitespace of each item; keep the object dtype if no item has such text
+    result = items.str.split(' ', n=1).str[1].astype(object).str.strip()
+    
+    ### Process "Kategorie" items
+    category = result[item_kind == 'Kategorie']
+    category = category[category.str.contains(COLON_OR_WHITESPACE_PATTERN, na=False)]
+    category_split = category.str.split(CATEGORY_SPLIT_PATTERN, n=1)
+    category_split = category_split[category_split.str.len() > 1]
+    event_category = category_split.str[0].str.strip().map(clean_event_category)
+    event_description = category_split.str[1].str.strip()
+    
+    ### Process "Veranstalter" items
+    organiser = result[item_kind == 'Veranstalter']
+    organiser = organiser[organiser.str.contains(COLON_OR_WHITESPACE_PATTERN, na=False)]
+    organiser_split = organiser.str.split(ORGANISER_SPLIT_PATTERN, n=1)
+    organiser_detail = organiser_split.str[1].str.strip()
+    organiser = organiser_split.str[0].str.strip().where(organiser_detail.notna())
+    organiser = organiser.map(clean_organiser, na_action='ignore')
+    
+    # Use the organiser as organiser_detail if no details are given
+    organiser_detail = organiser_detail.where(organiser_detail.str.len() > 0)
+    organiser_detail = organiser_detail.map(clean_organiser_detail, na_action='ignore').fillna(organiser)
+    
+    ### Process "Teilnehmer" items
+    # If string contains '-' (e.g. 10-20) match all digits after '-'; else match the first digits
+    participant_count = result[item_kind == 'Teilnehmer'].str.extract(PARTICIPANTS_PATTERN)
+    participant_count = participant_count[0].fillna(participant_count[1])
+    
+    ### Process "Technik" items
+    equipment_items = result[item_kind == 'Technik']
+    
+    # Equipment items are highly repetitive (e.g. "keine"); only scan every distinct item once
+    equipment_codes, equipment_uniques = pd.factorize(equipment_items, use_na_sentinel=False)
+    equipment_uniques = pd.Series(equipment_uniques, dtype=object).str.lower()
+    equipment_df = pd.DataFrame({
+        var: equipment_uniques.str.contains('|'.join(re.escape(key) for key in keys), na=False).to_numpy()[equipment_codes]
+        for var, keys in EQUIPMENT_PATTERNS.items()
+        }, index=equipment_items.index)
+    equipment = equipment_df.any(axis=1)
+    
+    ### Process "Catering" items
+    catering = result[item_kind == 'Catering'].str.contains('ja', regex=False, na=False)
+    
+    ### Process "Anmerkung" items
+    notes = result[item_kind == 'Anmerkung']
+    notes = notes.where(notes.str.len() > 0)
+    
+    description_df = pd.DataFrame({
+        'event_category': event_category,
+        'event_description': event_description,
+        'organiser': organiser,
+        'organiser_detail': organiser_detail,
+        'participant_count': participant_count,
+        'equip': equipment,
+        'equip_vr': equipment_df['equipment_vr'],
+        'equip_eyetracking': equipment_df['equipment_eye_tracking'],
+        'equip_clevertouch': equipment_df['equipment_clevertouch'],
+        'equip_dt': equipment_df['equipment_design_thinking'],
+        'equip_monitor': equipment_df['equipment_large_monitor'],
+        'catering': catering,
+        'notes': notes
+        }, columns=DESCRIPTION_COLUMNS).reindex(desc_lists.index).astype(object)
+    
+    # Process the remaining events row-wise
+    if len(fallback_idx):
+        description_df.loc[fallback_idx] = [process_description(x, verbose=verbose) for x in desc_lists.loc[fallback_idx]]
+        
+    # Use None for missing values like process_description
+    description_df = description_df.where(description_df.notna(), None)
+    
+    return description_df.infer_objects()
 
     
 def clean_calendar_dataframe(df: pd.DataFrame, verbose: bool = False) -> pd.DataFrame:
@@ -413,10 +605,10 @@ def clean_calendar_dataframe(df: pd.DataFrame, verbose: bool = False) -> pd.Data
         `created (pd.Timestamp)`: Creation date of the event.
         `event_desc_list (list[str])`: List of event description strings.
         `event_desc (str)`: Raw event description.
-        `event_category (str)`: Cleaned event category, e.g. Lehrveranstaltung, Workshop etc.
+        `event_category (category)`: Cleaned event category, e.g. Lehrveranstaltung, Workshop etc.
         `event_description (str)`: Detailed description of the event.
-        `organiser (str)`: Main organiser of the event, e.g. UB, Uni, Studis, Extern.
-        `organiser_detail (str)`: Additional details about the organiser.
+        `organiser (category)`: Main organiser of the event, e.g. UB, Uni, Studis, Extern.
+        `organiser_detail (category)`: Additional details about the organiser.
         `participant_count (str)`: Number of participants.
         `equip (bool)`: Indicator if any equipment is required.
         `equip_vr (bool)`: Indicator if VR equipment is required.
@@ -427,41 +619,26 @@ def clean_calendar_dataframe(df: pd.DataFrame, verbose: bool = False) -> pd.Data
         `catering (bool)`: Indicator if catering is required.
         `notes (str)`: Additional notes about the event.
     """
-    # Create a temporary copy of the DataFrame to work with
-    temp_df = df.copy()
-                
-    # Drop columns that have less than 5 % non-null values
-    threshold = len(temp_df) / 100 * 5
-    temp_df_processed = temp_df.dropna(axis=1, thresh=threshold)
-    
-    # Drop columns that do not contain relevant data
-    columns_to_drop = ['X-MICROSOFT-CDO-BUSYSTATUS', 'CLASS', 'PRIORITY', 'DTSTAMP', 
-                       'TRANSP', 'SEQUENCE', 'LAST-MODIFIED', 'BEGIN', 'END', 'STATUS']
-    
-    for col in temp_df_processed.columns:
-        if col in columns_to_drop:
-            temp_df_processed = temp_df_processed.drop(columns=[col])
-    
-    # Split the data of the DESCRIPTION column and store it in the new column DESCRIPTION_RAW
-    temp_df_processed['DESCRIPTION_RAW'] = temp_df_processed['DESCRIPTION'].str.split('¶')
-    
-    # Rename columns for easier data access
-    temp_df_processed = temp_df_processed.rename(columns={
+    # Relevant columns and their new names for easier data access; all other columns are dropped
+    column_names = {
         'UID': 'id',
         'DTEND': 'event_end',
         'DTSTART': 'event_start',
         'SUMMARY': 'event_title',
         'CREATED': 'created',
-        'DESCRIPTION_RAW': 'event_desc_list',
         'DESCRIPTION': 'event_desc'
-        })
+        }
+    
+    # Select the relevant columns that have at least 5 % non-null values in a single pass
+    threshold = len(df) / 100 * 5
+    keep_columns = [col for col in column_names if col in df.columns and df[col].count() >= threshold]
+    temp_df_processed = df[keep_columns].rename(columns=column_names)
+    
+    # Split the data of the event_desc column and store it in the new column event_desc_list
+    temp_df_processed['event_desc_list'] = temp_df_processed['event_desc'].str.split('¶')
     
     # Clean the data of event_desc_list and create new columns accordingly
-    temp_df_processed[[
-        'event_category', 'event_description', 'organiser', 'organiser_detail', 'participant_count', 
-        'equip', 'equip_vr', 'equip_eyetracking', 'equip_clevertouch', 'equip_dt', 'equip_monitor', 
-        'catering', 'notes'
-        ]] = temp_df_processed['event_desc_list'].apply(lambda x: process_description(x, verbose=verbose))
+    temp_df_processed[DESCRIPTION_COLUMNS] = process_descriptions(temp_df_processed['event_desc_list'], verbose=verbose)
     
     # Re-order columns for better clarity
     new_column_layout = ['id', 'created', 'event_title', 'event_start', 'event_end', 'event_category', 
@@ -475,7 +652,8 @@ def clean_calendar_dataframe(df: pd.DataFrame, verbose: bool = False) -> pd.Data
         'int': ['participant_count'],
         'date': ['created', 'event_start', 'event_end'],
         'bool': ['equip', 'equip_clevertouch', 'equip_dt', 'equip_eyetracking', 'equip_monitor', 
-                 'equip_vr', 'catering']
+                 'equip_vr', 'catering'],
+        'category': ['event_category', 'organiser', 'organiser_detail']
     }
     
     for dtype, columns in column_dtypes.items():
@@ -484,7 +662,12 @@ def clean_calendar_dataframe(df: pd.DataFrame, verbose: bool = False) -> pd.Data
                 if dtype == 'int':
                     temp_df_processed[col] = temp_df_processed[col].fillna(0).astype('int16')
                 elif dtype == 'date':
-                    temp_df_processed[col] = pd.to_datetime(temp_df_processed[col], errors='coerce')
+                    # Dates are UTC date-times of the iCalendar format; parse them with the format instead of inferring it
+                    temp_df_processed[col] = pd.to_datetime(temp_df_processed[col], format=ICS_DATETIME_FORMAT, 
+                                                            utc=True, errors='coerce')
+                elif dtype == 'category':
+                    # Store low cardinality string columns as categories
+                    temp_df_processed[col] = temp_df_processed[col].astype('category')
             else:
                 if verbose:
                     print(f'{col} not a column. Skipping ...')